@@ -3,16 +3,18 @@
 from __future__ import annotations
 
 import argparse
+import concurrent.futures
 import copy
-import json
 import logging
+import operator
 import os
-from dataclasses import asdict
-from typing import cast
+import pathlib
+import threading
+from typing import Any, cast
 
 import config as chatbot_config
 import pandas as pd
-from modeling import make_predictions, process_data
+from modeling import json_loads, make_predictions, process_data
 
 from zeno_build.experiments import search_space
 from zeno_build.experiments.experiment_run import ExperimentRun
@@ -22,6 +24,28 @@ from zeno_build.reporting import reporting_utils
 from zeno_build.reporting.visualize import visualize
 
 
+def _fork_space(
+    space: search_space.CombinatorialSearchSpace,
+) -> search_space.CombinatorialSearchSpace:
+    """Shallow-copy a search space so its dimensions can be reassigned.
+
+    The dimensions themselves are immutable dataclasses, so only the space
+    and its dimension dict need to be copied — no deep copy of the whole
+    config graph is necessary.
+    """
+    new_space = copy.copy(space)
+    new_space.dimensions = dict(space.dimensions)
+    return new_space
+
+
+def _load_run_files(param_file: str) -> tuple[dict[str, Any], list[str]]:
+    """Load the parameters and predictions for a single completed run."""
+    assert param_file.endswith(".zbp")
+    loaded_parameters = json_loads(pathlib.Path(param_file).read_bytes())
+    predictions = json_loads(pathlib.Path(f"{param_file[:-4]}.json").read_bytes())
+    return loaded_parameters, predictions
+
+
 def chatbot_main(
     models: list[str],
     single_model: str,
@@ -32,11 +56,12 @@ def chatbot_main(
     results_dir: str,
     do_prediction: bool = True,
     do_visualization: bool = True,
+    max_concurrent_trials: int = 1,
 ):
     """Run the chatbot experiment."""
     # Update the experiment settings with the provided models and prompts
     experiment_settings: list[search_space.CombinatorialSearchSpace] = [
-        copy.deepcopy(chatbot_config.experiments[x]) for x in experiments
+        _fork_space(chatbot_config.experiments[x]) for x in experiments
     ]
     for setting in experiment_settings:
         if isinstance(setting.dimensions["model_preset"], search_space.Categorical):
@@ -74,11 +99,10 @@ def chatbot_main(
     )
 
     # Organize the data into labels (output) and context (input)
-    labels: list[str] = []
-    contexts: list[ChatMessages] = []
-    for candl in contexts_and_labels:
-        labels.append(candl.messages[-1].content)
-        contexts.append(ChatMessages(candl.messages[:-1]))
+    labels: list[str] = [x.messages[-1].content for x in contexts_and_labels]
+    contexts: list[ChatMessages] = [
+        ChatMessages(x.messages[:-1]) for x in contexts_and_labels
+    ]
 
     if do_prediction:
         # Perform the hyperparameter sweep
@@ -89,11 +113,23 @@ def chatbot_main(
             num_trials=chatbot_config.num_trials,
         )
 
-        while not optimizer.is_complete(predictions_dir, include_in_progress=True):
-            # Get parameters
-            parameters = optimizer.get_parameters()
-            if parameters is None:
-                break
+        # The optimizer itself is not thread-safe, so guard it with a lock.
+        # The CacheLock in make_predictions handles cross-process safety.
+        optimizer_lock = threading.Lock()
+
+        # Scan the predictions directory once up front, then track completed
+        # trials incrementally rather than re-listing it every iteration.
+        completed_trials = set(
+            my_space.get_valid_param_files(predictions_dir, include_in_progress=True)
+        )
+
+        def get_next_parameters() -> dict[str, Any] | None:
+            with optimizer_lock:
+                if optimizer.is_complete_from_set(completed_trials):
+                    return None
+                return optimizer.get_parameters()
+
+        def run_trial(parameters: dict[str, Any]) -> float | None:
             # Get the run ID and resulting predictions
             id_and_predictions = make_predictions(
                 contexts=contexts,
@@ -107,21 +143,58 @@ def chatbot_main(
                 hf_inference_method=hf_inference_method,
             )
             if id_and_predictions is None:
-                print(f"*** Skipped run for {parameters=} ***")
-                continue
+                # Another process holds the cache lock for this trial, so
+                # re-scan the directory to pick up its progress; otherwise
+                # the completion check would never observe concurrent runs.
+                with optimizer_lock:
+                    completed_trials.clear()
+                    completed_trials.update(
+                        my_space.get_valid_param_files(
+                            predictions_dir, include_in_progress=True
+                        )
+                    )
+                return None
             # Run or read the evaluation result
             id, predictions = id_and_predictions
-            if os.path.exists(f"{predictions_dir}/{id}.eval"):
-                with open(f"{predictions_dir}/{id}.eval", "r") as f:
-                    eval_result = float(next(f).strip())
+            with optimizer_lock:
+                completed_trials.add(os.path.join(predictions_dir, f"{id}.zbp"))
+            eval_path = pathlib.Path(predictions_dir) / f"{id}.eval"
+            if eval_path.exists():
+                eval_result = float(eval_path.read_text().split("\n", 1)[0])
             else:
                 eval_result = optimizer.calculate_metric(contexts, labels, predictions)
-                with open(f"{predictions_dir}/{id}.eval", "w") as f:
-                    f.write(f"{eval_result}")
-            # Print out the results
-            print("*** Iteration complete. ***")
-            print(f"Eval: {eval_result}, Parameters: {parameters}")
-            print("***************************")
+                eval_path.write_text(f"{eval_result}")
+            return eval_result
+
+        # Run trials concurrently, since each one is an independent
+        # I/O-bound call to a remote model or local inference server.
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_concurrent_trials
+        ) as executor:
+            futures: dict[concurrent.futures.Future[float | None], dict[str, Any]] = {}
+            exhausted = False
+            while futures or not exhausted:
+                while not exhausted and len(futures) < max_concurrent_trials:
+                    parameters = get_next_parameters()
+                    if parameters is None:
+                        exhausted = True
+                        break
+                    futures[executor.submit(run_trial, parameters)] = parameters
+                if not futures:
+                    break
+                done, _ = concurrent.futures.wait(
+                    futures, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for future in done:
+                    parameters = futures.pop(future)
+                    eval_result = future.result()
+                    if eval_result is None:
+                        print(f"*** Skipped run for {parameters=} ***")
+                        continue
+                    # Print out the results
+                    print("*** Iteration complete. ***")
+                    print(f"Eval: {eval_result}, Parameters: {parameters}")
+                    print("***************************")
 
     if do_visualization:
         param_files = my_space.get_valid_param_files(
@@ -131,25 +204,26 @@ def chatbot_main(
             logging.getLogger().warning(
                 "Not enough completed but performing visualization anyway."
             )
-        results: list[ExperimentRun] = []
-        for param_file in param_files:
-            assert param_file.endswith(".zbp")
-            with open(param_file, "r") as f:
-                loaded_parameters = json.load(f)
-            with open(f"{param_file[:-4]}.json", "r") as f:
-                predictions = json.load(f)
-            name = reporting_utils.parameters_to_name(loaded_parameters, my_space)
-            results.append(
-                ExperimentRun(
-                    parameters=loaded_parameters, predictions=predictions, name=name
-                )
+        # The parameter/prediction file pairs are independent, so read them
+        # with a thread pool to overlap the I/O.
+        with concurrent.futures.ThreadPoolExecutor(max_workers=32) as executor:
+            loaded_runs = list(executor.map(_load_run_files, param_files))
+        # Sort by name before building the runs, so the comparisons work on
+        # plain strings rather than going through attribute access
+        names = [
+            reporting_utils.parameters_to_name(x, my_space) for x, _ in loaded_runs
+        ]
+        results: list[ExperimentRun] = [
+            ExperimentRun(parameters=params, predictions=predictions, name=name)
+            for name, (params, predictions) in sorted(
+                zip(names, loaded_runs), key=operator.itemgetter(0)
             )
-        results.sort(key=lambda x: x.name)
+        ]
 
         # Perform the visualization
         df = pd.DataFrame(
             {
-                "messages": [[asdict(y) for y in x.messages] for x in contexts],
+                "messages": [x.to_dict()["messages"] for x in contexts],
                 "label": labels,
             }
         )
@@ -207,6 +281,12 @@ if __name__ == "__main__":
         help="The method used to perform inference on HuggingFace models.",
         choices=["huggingface", "vllm"],
     )
+    parser.add_argument(
+        "--max-concurrent-trials",
+        type=int,
+        default=1,
+        help="The number of parameter combinations to run concurrently.",
+    )
     parser.add_argument(
         "--results-dir",
         type=str,
@@ -240,4 +320,5 @@ if __name__ == "__main__":
         results_dir=args.results_dir,
         do_prediction=not args.skip_prediction,
         do_visualization=not args.skip_visualization,
+        max_concurrent_trials=args.max_concurrent_trials,
     )
@@ -2,16 +2,27 @@
 from __future__ import annotations
 
 import dataclasses
+import hashlib
 import itertools
 import json
 import os
 import traceback
 from collections.abc import Iterable
-from typing import Literal
+from typing import Any, Literal
 
 import config as chatbot_config
 import datasets
 
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from zeno_build.cache_utils import (
     CacheLock,
     fail_cache,
@@ -22,6 +33,20 @@ from zeno_build.models.chat_generate import generate_from_chat_prompt
 from zeno_build.prompts.chat_prompt import ChatMessages, ChatTurn
 
 
+def json_loads(data: str | bytes) -> Any:
+    """Parse JSON with orjson when available, falling back to stdlib json."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj: Any) -> str:
+    """Serialize JSON with orjson when available, falling back to stdlib json."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj)
+
+
 def build_examples_from_sequence(seq: list[str]) -> Iterable[ChatMessages]:
     """Convert a datapoint into dialog examples."""
     stripped_seq = [x.strip() for x in seq]
@@ -90,7 +115,7 @@ def process_data(
     output_path = get_cache_path(output_dir, parameters, "jsonl")
     if os.path.exists(output_path):
         with open(output_path, "r") as f:
-            return [ChatMessages.from_dict(json.loads(x)) for x in f]
+            return [ChatMessages.from_dict(json_loads(x)) for x in f]
 
     # Load and standardize from Hugging Face if not in cache
     if isinstance(dataset, tuple):
@@ -125,11 +150,61 @@ def process_data(
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
     with open(output_path, "w") as f:
         for x in messages:
-            print(json.dumps(x.to_dict()), file=f)
+            print(json_dumps(x.to_dict()), file=f)
 
     return messages
 
 
+# Caches of deterministic LLM responses, keyed by cache directory
+_llm_caches: dict[str, Any] = {}
+
+
+def _get_llm_cache(output_dir: str) -> Any | None:
+    """Get the disk-backed LLM response cache for an output directory.
+
+    Args:
+        output_dir: The directory that the cache lives under.
+
+    Returns:
+        The cache, or None if diskcache is not installed.
+    """
+    if diskcache is None:
+        return None
+    cache = _llm_caches.get(output_dir)
+    if cache is None:
+        cache = diskcache.Cache(os.path.join(output_dir, "llm_cache"))
+        cache.stats(enable=True)
+        _llm_caches[output_dir] = cache
+    return cache
+
+
+def _llm_cache_key(
+    parameters: dict[str, Any], contexts: list[ChatMessages]
+) -> str | None:
+    """Compute the cache key for an LLM call, or None if it is not cacheable.
+
+    Only deterministic (temperature == 0) calls are cached, since sampled
+    outputs should differ between runs. Parameters that cannot change a
+    deterministic output (top_p, which has no effect on greedy decoding)
+    are excluded from the key, so parameter combinations differing only in
+    those dimensions share one cached response.
+
+    Args:
+        parameters: The generation parameters for the call.
+        contexts: The chat contexts to generate from.
+
+    Returns:
+        A hash of the full request payload, or None to skip caching.
+    """
+    if parameters["temperature"] > 0:
+        return None
+    payload = {k: v for k, v in parameters.items() if k != "top_p"}
+    payload["contexts"] = [x.to_dict() for x in contexts]
+    return hashlib.sha256(
+        json.dumps(payload, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+
+
 def make_predictions(
     contexts: list[ChatMessages],
     prompt_preset: str,
@@ -173,7 +248,7 @@ def make_predictions(
     system_id, file_root = get_cache_id_and_path(output_dir, parameters)
     if os.path.exists(f"{file_root}.json"):
         with open(f"{file_root}.json", "r") as f:
-            return system_id, json.load(f)
+            return system_id, json_loads(f.read())
 
     with CacheLock(file_root) as cache_lock:
         # If the cache is locked, then another process is already generating
@@ -186,16 +261,30 @@ def make_predictions(
             my_model = chatbot_config.model_configs[model_preset]
             if my_model.provider == "huggingface":
                 my_model = dataclasses.replace(my_model, provider=hf_inference_method)
-            # Generate from the chat prompt
-            predictions: list[str] = generate_from_chat_prompt(
-                contexts,
-                chatbot_config.prompt_messages[prompt_preset],
-                my_model,
-                temperature,
-                max_tokens,
-                top_p,
-                context_length,
+            # Short-circuit deterministic calls that repeat across the sweep
+            llm_cache = _get_llm_cache(output_dir)
+            cache_key = (
+                _llm_cache_key(parameters, contexts) if llm_cache is not None else None
+            )
+            predictions: list[str] | None = (
+                llm_cache.get(cache_key) if cache_key is not None else None
             )
+            if predictions is None:
+                # Generate from the chat prompt
+                predictions = generate_from_chat_prompt(
+                    contexts,
+                    chatbot_config.prompt_messages[prompt_preset],
+                    my_model,
+                    temperature,
+                    max_tokens,
+                    top_p,
+                    context_length,
+                )
+                if cache_key is not None:
+                    llm_cache[cache_key] = predictions
+            if llm_cache is not None:
+                hits, misses = llm_cache.stats()
+                print(f"LLM cache: {hits} hits, {misses} misses")
         except Exception:
             tb = traceback.format_exc()
             fail_cache(file_root, tb)
@@ -203,6 +292,6 @@ def make_predictions(
 
         # Dump the predictions
         with open(f"{file_root}.json", "w") as f:
-            json.dump(predictions, f)
+            f.write(json_dumps(predictions))
 
     return system_id, predictions
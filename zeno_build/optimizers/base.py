@@ -81,6 +81,25 @@ class Optimizer(abc.ABC):
         )
         return len(valid_param_files) >= self.num_trials
 
+    def is_complete_from_set(self, completed: set[str]) -> bool:
+        """Check if the optimizer has completed from a set of finished trials.
+
+        This is a fast path for is_complete that avoids re-scanning the
+        output directory on every call. The caller primes the set with one
+        directory scan (e.g. through the search space's
+        get_valid_param_files) and adds each trial's parameter file to it as
+        the trial finishes.
+
+        Args:
+            completed: The parameter files of finished or in-progress trials.
+
+        Returns:
+            True if the optimizer run has completed.
+        """
+        if self.num_trials is None:
+            return False
+        return len(completed) >= self.num_trials
+
     @abc.abstractmethod
     def get_parameters(self) -> dict[str, Any] | None:
         """Get the next parameters to optimize.
@@ -106,3 +106,26 @@ def test_exhaustive_composite():
             break
         all_param_choices.append(params)
     assert all_params == all_param_choices
+
+
+def test_is_complete_from_set():
+    """Test the fast-path completion check over a set of finished trials."""
+    space = search_space.CombinatorialSearchSpace(
+        {
+            "training_dataset": search_space.Categorical(["imdb", "sst2"]),
+        }
+    )
+
+    # With no trial limit, the optimizer never reports completion
+    optimizer = ExhaustiveOptimizer(
+        space=space, distill_functions=[], metric=input_length
+    )
+    assert not optimizer.is_complete_from_set({"a.zbp", "b.zbp"})
+
+    # With a trial limit, completion is reached at the threshold
+    optimizer = ExhaustiveOptimizer(
+        space=space, distill_functions=[], metric=input_length, num_trials=2
+    )
+    assert not optimizer.is_complete_from_set(set())
+    assert not optimizer.is_complete_from_set({"a.zbp"})
+    assert optimizer.is_complete_from_set({"a.zbp", "b.zbp"})